@@ -12,12 +12,12 @@ import shutil
 from collections import OrderedDict
 from enum import Enum, Flag, auto
 from functools import wraps, singledispatch
-from hashlib import md5
+from hashlib import blake2b, md5
 from secrets import token_hex
 from typing import *
 
 from . import _lang_python, lang
-from .Targets import Target, Runtime
+from .Targets import Target, Runtime, _get_host_cpu_identity
 from .Parameter import *
 from .Constants import inf
 from .Platforms import Platform, get_library_reference
@@ -26,6 +26,37 @@ _R_DIM3 = r'dim3\((\d+),\s*(\d+),\s*(\d+)\)'
 _R_GPU_LAUNCH = f"<<<{_R_DIM3},\s*{_R_DIM3}>>>"
 del _R_DIM3
 
+# Environment variable naming an optional directory for caching lowered build outputs across runs
+_BUILD_CACHE_DIR_ENV = "ACCERA_BUILD_CACHE_DIR"
+
+
+def _toolchain_identity() -> tuple:
+    "Identifies the lowering tools by path, size and modification time, so that rebuilt tools invalidate the cache"
+    from . import accc
+
+    identity = []
+    for tool in [accc.ACCCConfig.rc_opt, accc.ACCCConfig.acc_translate, accc.ACCCConfig.mlir_translate,
+                 accc.ACCCConfig.llvm_opt, accc.ACCCConfig.llc]:
+        tool = os.path.abspath(tool)
+        try:
+            stat = os.stat(tool)
+            identity.append((tool, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            identity.append((tool, None, None))
+    return tuple(identity)
+
+
+def _lowering_cache_key(mlir_filepath: str, *settings) -> str:
+    "Fingerprints the generated MLIR file together with the toolchain and the settings that affect its lowering"
+    # __version__ is None in CMake-driven builds, where the toolchain identity distinguishes builds instead
+    from . import __version__
+
+    h = blake2b(digest_size=16)
+    with open(mlir_filepath, "rb") as f:
+        h.update(f.read())
+    h.update(repr((__version__, _toolchain_identity()) + settings).encode())
+    return h.hexdigest()
+
 
 @singledispatch
 def _convert_arg(arg: _lang_python._lang._Valor):
@@ -428,6 +459,11 @@ class Package:
             platform: The platform where the package will run.
             tolerance: The tolerance for correctness checking when `mode = Package.Mode.DEBUG`.
             output_dir: The path to an output directory. Defaults to the current directory if unspecified.
+
+        If the ACCERA_BUILD_CACHE_DIR environment variable is set to a directory, the lowered outputs are cached
+        there, keyed on the generated MLIR, the build settings, the toolchain and (for host targets) the host CPU.
+        Later builds of an identical package reuse the cached outputs instead of re-running the lowering pipeline.
+        Formats that dump intermediate IR are never cached.
         """
 
         from . import accc
@@ -493,15 +529,45 @@ class Package:
         # Enable dumping of IR passes based on build format
         dump_ir = bool(format & (Package.Format.MLIR | Package.Format.MLIR_VERBOSE))
         dump_ir_verbose = bool(format & Package.Format.MLIR_VERBOSE)
-        proj.generate_and_emit(
-            build_config=mode.value,
-            system_target=target._device_name,
-            runtime=target.runtime.name,
-            dump_all_passes=dump_ir,
-            dump_intrapass_ir=dump_ir_verbose,
-            gpu_only=compiler_options.gpu_only,
-            quiet=_quiet
-        )
+
+        # Lowering is deterministic in the generated MLIR and the build settings, so a cached
+        # copy of the module outputs can be reused instead of re-running the pass pipeline
+        cache_dir = None
+        build_cache_dir = os.environ.get(_BUILD_CACHE_DIR_ENV)
+        if build_cache_dir and not dump_ir:
+            cache_dir = os.path.join(
+                os.path.expanduser(build_cache_dir),
+                _lowering_cache_key(
+                    proj.module_file_sets[0].generated_mlir_filepath, mode.value, target._device_name,
+                    target.runtime.name, output_type.name, compiler_options.gpu_only,
+                    # host code is compiled for the native CPU, so it is only reusable on the same kind of CPU
+                    _get_host_cpu_identity() if target._device_name == accc.SystemTarget.HOST.value else None
+                )
+            )
+
+        module_dir = proj.module_file_sets[0].module_dir
+        if cache_dir and os.path.isdir(cache_dir):
+            # copytree's dirs_exist_ok flag is Python 3.8+ only
+            shutil.rmtree(module_dir, ignore_errors=True)
+            shutil.copytree(cache_dir, module_dir)
+        else:
+            proj.generate_and_emit(
+                build_config=mode.value,
+                system_target=target._device_name,
+                runtime=target.runtime.name,
+                dump_all_passes=dump_ir,
+                dump_intrapass_ir=dump_ir_verbose,
+                gpu_only=compiler_options.gpu_only,
+                quiet=_quiet
+            )
+            if cache_dir:
+                # Populate under a temporary name so that concurrent builds never see a partial entry
+                staging_dir = f"{cache_dir}.{token_hex(4)}"
+                shutil.copytree(module_dir, staging_dir)
+                try:
+                    os.rename(staging_dir, cache_dir)
+                except OSError:
+                    shutil.rmtree(staging_dir, ignore_errors=True)
 
         path_root = os.path.join(output_dir, name)
         extension = ".hat"
@@ -634,15 +700,13 @@ class Package:
             version: The package version.
         """
         if other:
-            if "auxiliary" not in self._description:
-                self._description["auxiliary"] = other
-            else:
-                self._description["auxiliary"].update(other)
-
-            # remove any keys marked None
-            keys_to_remove = [k for k, v in self._description["auxiliary"].items() if v is None]
-            for k in keys_to_remove:
-                del self._description["auxiliary"][k]
+            # merge only the keys provided, removing any keys marked None
+            auxiliary = self._description.setdefault("auxiliary", {})
+            for k, v in other.items():
+                if v is None:
+                    auxiliary.pop(k, None)
+                else:
+                    auxiliary[k] = v
 
         if version is not None:
             self._description["version"] = version
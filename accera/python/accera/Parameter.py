@@ -67,8 +67,11 @@ def create_parameter_grid(
 
     choice_variants = itertools.product(*choices)
 
-    filtered_choice_variants = list(filter(filter_func, choice_variants))
-    if sample > 0 and sample < len(filtered_choice_variants):
-        filtered_choice_variants = random.sample(filtered_choice_variants, sample)
+    filtered_choice_variants = filter(filter_func, choice_variants)
+    if sample > 0:
+        # sampling needs the full population, otherwise the variants are consumed as they are generated
+        filtered_choice_variants = list(filtered_choice_variants)
+        if sample < len(filtered_choice_variants):
+            filtered_choice_variants = random.sample(filtered_choice_variants, sample)
 
     return [dict(zip(keys, variant)) for variant in filtered_choice_variants]
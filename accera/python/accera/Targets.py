@@ -6,6 +6,7 @@
 import copy
 import cpuinfo
 import re
+from functools import lru_cache
 from typing import List, Union
 from dataclasses import dataclass, field, fields
 from enum import Enum, auto
@@ -831,6 +832,22 @@ class _Models_enum_str:
 Model = None
 
 
+@lru_cache(maxsize=None)
+def _get_host_cpu_info() -> dict:
+    "Queries the host CPU, which is slow and doesn't change during a session"
+    return cpuinfo.get_cpu_info()
+
+
+def _get_host_cpu_brand() -> str:
+    return _get_host_cpu_info()['brand_raw']
+
+
+def _get_host_cpu_identity() -> tuple:
+    "Identifies the host CPU that -mcpu=native code is generated for"
+    info = _get_host_cpu_info()
+    return (info.get('brand_raw', ""), tuple(sorted(info.get('flags', []))))
+
+
 def _recompute_known_devices():
     model_names = []
     for device in KNOWN_CPUS:
@@ -996,7 +1013,7 @@ class Target(_TargetContainer):
 
     def _try_get_known_name(self, known_name):
         if known_name == "HOST":
-            cpu_info = cpuinfo.get_cpu_info()
+            cpu_brand = _get_host_cpu_brand()
 
             # use regular expression to match the names in known devices with the model name from cpuinfo,
             # the regex looks like ^.*?\b[word1]\b.*?\b[word2]\b.*?\b[word3]\b.*? ... \b[wordN]\b.*?
@@ -1009,7 +1026,7 @@ class Target(_TargetContainer):
                 for info in name_info:
                     regex_match = regex_match + r'\b' + info + r'\b.*?'
 
-                match = re.match(regex_match, cpu_info['brand_raw'], re.IGNORECASE)
+                match = re.match(regex_match, cpu_brand, re.IGNORECASE)
                 if match:
                     return m.name
 
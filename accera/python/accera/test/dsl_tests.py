@@ -7,15 +7,22 @@
 # Tip: to run a particular test / set of tests:
 # python -m unittest discover -k "test_input_array" path_to_accera/test dsl_tests.py
 # python -m unittest discover -k "DSLTest_01" path_to_accera/test dsl_tests.py
+# Tests build into separate output directories, and can be run in parallel. loadscope keeps each TestCase class
+# on one worker so that its setUpClass data is shared, while the classes are spread across the workers:
+# python -m pytest -n auto --dist=loadscope path_to_accera/test/dsl_tests.py
+# To skip re-lowering unchanged kernels across runs, point the build cache at a persistent directory:
+# ACCERA_BUILD_CACHE_DIR=~/.cache/accera-test python -m unittest discover path_to_accera/test dsl_tests.py
 
 import logging
 import sys
 import unittest
+from unittest import mock
 import os
 import pathlib
+import shutil
 import numpy as np
 from enum import Enum
-from typing import Callable, Tuple
+from typing import Callable, List, Tuple
 
 DEV_MODE = False
 if "@CMAKE_INSTALL_PREFIX@"[1:-1] != "CMAKE_INSTALL_PREFIX":
@@ -29,8 +36,18 @@ from accera.test import verifiers
 
 TEST_MODE = Package.Mode.DEBUG if DEV_MODE else Package.Mode.RELEASE
 TEST_FORMAT = Package.Format.MLIR_DYNAMIC if DEV_MODE else Package.Format.HAT_DYNAMIC
+# for packages that are only built (not correctness-checked), a static library skips the dynamic linking step,
+# and the debug mode equivalence checks are never run
+TEST_MODE_NOCHECK = Package.Mode.RELEASE
+TEST_FORMAT_NOCHECK = Package.Format.MLIR_STATIC if DEV_MODE else Package.Format.HAT_STATIC
 TEST_PACKAGE_DIR = "test_acccgen"
 
+# The OpenMP runtime reads OMP_DISPLAY_AFFINITY once when it initializes in the process, so this applies to the
+# whole run. It is skipped for parallel test workers (e.g. pytest-xdist), whose displays would interleave on stdout,
+# and can be overridden by setting OMP_DISPLAY_AFFINITY in the environment.
+if "PYTEST_XDIST_WORKER" not in os.environ:
+    os.environ.setdefault("OMP_DISPLAY_AFFINITY", "TRUE")
+
 # Groups of types commonly used for tests
 INT_TYPES = [
     ScalarType.int8, ScalarType.int16, ScalarType.int32, ScalarType.int64, ScalarType.uint8, ScalarType.uint16,
@@ -38,9 +55,43 @@ INT_TYPES = [
 ]
 FLOAT_TYPES = [ScalarType.float16, ScalarType.float32, ScalarType.float64]
 
+# float16 intrinsics are emulated in software and are slow to build, set ACCERA_TEST_FP16=1 to test them
+TEST_FP16_INTRINSICS = os.environ.get("ACCERA_TEST_FP16", "0") == "1"
+
+# Mapping of each scalar type to its numpy type, computed once instead of per use
+SCALAR_DTYPES = {t: np.dtype(t.name)
+                 for t in [ScalarType.bool] + INT_TYPES + FLOAT_TYPES}
+
+# Data for constant arrays of each supported numpy type, shared across tests.
+# Ones of the same width have the same bytes whether signed, unsigned or bool, so those
+# types are zero-copy views of a single buffer per width
+CONST_ARRAY_DATA = {}
+for dts in [(np.int8, np.uint8, bool), (np.int16, np.uint16), (np.int32, np.uint32), (np.int64, np.uint64),
+            (np.float16, ), (np.float32, ), (np.float64, )]:
+    _D = np.ones((128, 256), dtype=dts[0])
+    CONST_ARRAY_DATA.update({np.dtype(dt): _D.view(dt) for dt in dts})
+del dts, _D
+
+# Seeded generator for test values, so that failures can be reproduced across runs
+_RNG = np.random.default_rng(0)
+
+
+def _sliding_windows(A: "numpy.ndarray", K: int) -> "numpy.ndarray":
+    "Creates a read-only view of the K-element windows of a 1-D array"
+    if hasattr(np.lib.stride_tricks, "sliding_window_view"):
+        return np.lib.stride_tricks.sliding_window_view(A, K)
+    # sliding_window_view is numpy 1.20+ only
+    return np.lib.stride_tricks.as_strided(A, shape=(A.shape[0] - K + 1, K), strides=A.strides * 2, writeable=False)
+
+
+def _random_float32(shape: Tuple[int]) -> "numpy.ndarray":
+    "Creates float32 random values in [0, 1) without a float64 intermediate"
+    return _RNG.random(shape, dtype=np.float32)
+
+
+# set ACCERA_TEST_VERBOSE=1 to log debug records, which otherwise slow down every logging call
 logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
-os.environ["OMP_DISPLAY_AFFINITY"] = "TRUE"
+logger.setLevel(logging.DEBUG if os.environ.get("ACCERA_TEST_VERBOSE") else logging.WARNING)
 
 
 # TODO: Remove all @expectedFailure decorators as implementation converges with spec
@@ -70,6 +121,18 @@ def expectedFailure(reason: FailedReason, msg: str, condition: bool = True) -> C
 
 
 class DSLTest_01Arrays(unittest.TestCase):
+    # random input values for correctness checking, keyed by (shape, dtype, order)
+    _random_values = {}
+
+    @classmethod
+    def _get_random_values(cls, shape: Tuple[int], dtype, order="C") -> "numpy.ndarray":
+        # The cached values are shared across tests, callers must not modify them in-place
+        # (correctness checking operates on copies of the "pre" values)
+        key = (shape, np.dtype(dtype), order)
+        if key not in cls._random_values:
+            cls._random_values[key] = _RNG.random(shape).astype(dtype, order=order)
+        return cls._random_values[key]
+
     def _verify_nest(self, nest, args: Tuple[Array], package_name, correctness_check_values=None) -> None:
 
         # create a HAT package and add the function to it
@@ -95,26 +158,19 @@ class DSLTest_01Arrays(unittest.TestCase):
         self.assertIsNotNone(A)
 
     def test_input_array_dimension_layout(self) -> None:
-        A = Array(role=Array.Role.INPUT, element_type=ScalarType.float32, shape=(10, 20), layout=(1, 10))
-        self.assertIsNotNone(A)
-
-        A = Array(role=Array.Role.INPUT, element_type=ScalarType.float32, shape=(10, 20), layout=(10, 1))
-        self.assertIsNotNone(A)
-
-        A = Array(role=Array.Role.INPUT, element_type=ScalarType.float32, shape=(10, ), layout=(1, ))
-        self.assertIsNotNone(A)
-
-        A = Array(role=Array.Role.INPUT, element_type=ScalarType.float32, shape=(10, 20, 50), layout=(1, 10, 200))
-        self.assertIsNotNone(A)
-
-        A = Array(role=Array.Role.INPUT, element_type=ScalarType.float32, shape=(10, 20, 50), layout=(200, 10, 1))
-        self.assertIsNotNone(A)
-
-        A = Array(role=Array.Role.INPUT, element_type=ScalarType.float32, shape=(10, 20, 50), layout=(1, 200, 10))
-        self.assertIsNotNone(A)
-
-        A = Array(role=Array.Role.INPUT, element_type=ScalarType.float32, shape=(10, 20, 50), layout=(10, 200, 1))
-        self.assertIsNotNone(A)
+        layouts = [
+            ((10, 20), (1, 10)),
+            ((10, 20), (10, 1)),
+            ((10, ), (1, )),
+            ((10, 20, 50), (1, 10, 200)),
+            ((10, 20, 50), (200, 10, 1)),
+            ((10, 20, 50), (1, 200, 10)),
+            ((10, 20, 50), (10, 200, 1)),
+        ]
+        for shape, layout in layouts:
+            with self.subTest(shape=shape, layout=layout):
+                A = Array(role=Array.Role.INPUT, element_type=ScalarType.float32, shape=shape, layout=layout)
+                self.assertIsNotNone(A)
 
     def test_input_array_infinite_major_dimension(self) -> None:
         from accera import inf
@@ -138,37 +194,26 @@ class DSLTest_01Arrays(unittest.TestCase):
         self.assertEqual(A.shape[1], 16)
 
         package_name = "input_array_inf_test"
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
 
     def test_input_output_array(self) -> None:
         A = Array(role=Array.Role.INPUT_OUTPUT, element_type=ScalarType.float32, shape=(10, 20))
         self.assertIsNotNone(A)
 
     def test_const_array(self) -> None:
-        for dt in [
-                bool,    # np.bool is deprecated in favor of bool
-                np.int8,
-                np.int16,
-                np.int32,
-                np.int64,
-                np.uint8,
-                np.uint16,
-                np.uint32,
-                np.uint64,
-                np.float16,
-                np.float32,
-                np.float64
-        ]:
-            D = np.ones((128, 256), dtype=dt)
-            A = Array(role=Array.Role.CONST, data=D)
-            self.assertIsNotNone(A)
+        for dt, D in CONST_ARRAY_DATA.items():
+            with self.subTest(dtype=dt):
+                A = Array(role=Array.Role.CONST, data=D)
+                self.assertIsNotNone(A)
 
     def test_const_array_type_layout(self) -> None:
-        D = np.ones((128, 256), dtype=np.float64)
+        D = CONST_ARRAY_DATA[np.dtype(np.float64)]
         for t in [ScalarType.bool] + INT_TYPES + FLOAT_TYPES:
-            A = Array(role=Array.Role.CONST, element_type=t, layout=Array.Layout.LAST_MAJOR, data=D)
-            self.assertIsNotNone(A)
+            with self.subTest(element_type=t):
+                A = Array(role=Array.Role.CONST, element_type=t, layout=Array.Layout.LAST_MAJOR, data=D)
+                self.assertIsNotNone(A)
 
     def test_temp_array(self) -> None:
         A = Array(role=Array.Role.TEMP, element_type=ScalarType.float32, layout=Array.Layout.LAST_MAJOR, shape=(10, 20))
@@ -184,7 +229,7 @@ class DSLTest_01Arrays(unittest.TestCase):
         def make_test_fn(package, A, B, C):
             T = Array(role=Array.Role.TEMP, element_type=A.element_type, shape=A.shape)
 
-            nest = Nest(A.shape)
+            nest = Nest(shape=(256, 32))
             i, j = nest.get_indices()
 
             @nest.iteration_logic
@@ -201,8 +246,9 @@ class DSLTest_01Arrays(unittest.TestCase):
         package = Package()
         make_test_fn(package, A, B, C)
         package_name = "test_temp_array_materialization_1"
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
 
     def test_temp_array_materialization_2(self) -> None:
         # Materializes (allocates) a TEMP array within an added function
@@ -212,7 +258,7 @@ class DSLTest_01Arrays(unittest.TestCase):
         B = Array(shape=(256, 32), role=Array.Role.INPUT_OUTPUT)
 
         def make_init_function(package, A):
-            nest = Nest(A.shape)
+            nest = Nest(shape=(256, 32))
             i, j = nest.get_indices()
 
             @nest.iteration_logic
@@ -225,7 +271,7 @@ class DSLTest_01Arrays(unittest.TestCase):
 
         def make_helper_function2(package, A, B):
 
-            nest = Nest(A.shape)
+            nest = Nest(shape=(256, 32))
             i, j = nest.get_indices()
 
             @nest.iteration_logic
@@ -245,8 +291,9 @@ class DSLTest_01Arrays(unittest.TestCase):
         package.add(test_fn, args=(A, B))
 
         package_name = "test_temp_array_materialization_2"
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
 
         def test_fn_wrong_role(A, B):
             T = Array(role=Array.Role.INPUT_OUTPUT, element_type=A.element_type, shape=A.shape)
@@ -257,8 +304,9 @@ class DSLTest_01Arrays(unittest.TestCase):
         package.add(test_fn_wrong_role, args=(A, B))
 
         package_name = "test_temp_array_materialization_2_wrong_role"
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
         with self.assertRaises(ValueError):
-            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR, fail_on_error=True)
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir, fail_on_error=True)
 
     def test_temp_array_materialization_3(self) -> None:
         # Materializes (allocates) a TEMP array within some nest iteration logic
@@ -268,7 +316,7 @@ class DSLTest_01Arrays(unittest.TestCase):
         A = Array(shape=(256, 32), role=Array.Role.INPUT_OUTPUT)
         B = Array(shape=(256, 32), role=Array.Role.INPUT_OUTPUT)
 
-        nest = Nest(A.shape)
+        nest = Nest(shape=(256, 32))
         i, j = nest.get_indices()
 
         @nest.iteration_logic
@@ -285,8 +333,9 @@ class DSLTest_01Arrays(unittest.TestCase):
 
         package.add(nest, args=(A, B))
         package_name = "test_temp_array_materialization_3"
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
 
     def test_first_major_array_access(self) -> None:
         A = Array(shape=(256, 32), role=Array.Role.INPUT, layout=Array.Layout.FIRST_MAJOR)
@@ -298,9 +347,8 @@ class DSLTest_01Arrays(unittest.TestCase):
         def _():
             A[i, j] = 5.0
 
-        A_test = np.random.random((256, 32)).astype(np.float32)
-        A_expected = np.ndarray((256, 32)).astype(np.float32)
-        A_expected.fill(5.0)
+        A_test = self._get_random_values((256, 32), np.float32)
+        A_expected = np.full((256, 32), 5.0, dtype=np.float32)
         correctness_check_values = {
             "pre": (A_test, ),
             "post": (A_expected, )
@@ -319,9 +367,8 @@ class DSLTest_01Arrays(unittest.TestCase):
         def _():
             A[i, j] = 5.0
 
-        A_test = np.random.random((256, 32)).astype(np.float32, order="F")
-        A_expected = np.ndarray((256, 32)).astype(np.float32, order="F")
-        A_expected.fill(5.0)
+        A_test = self._get_random_values((256, 32), np.float32, order="F")
+        A_expected = np.full((256, 32), 5.0, dtype=np.float32, order="F")
         correctness_check_values = {
             "pre": (A_test, ),
             "post": (A_expected, )
@@ -344,13 +391,11 @@ class DSLTest_01Arrays(unittest.TestCase):
             A[i, j] = 5    # implicit cast from int8 to float
             B[i, j] = 10    # implicit cast from int8 to int32
 
-        A_test = np.random.random((256, 32)).astype(np.float32)
-        A_expected = np.ndarray((256, 32)).astype(np.float32)
-        A_expected.fill(5.0)
+        A_test = self._get_random_values((256, 32), np.float32)
+        A_expected = np.full((256, 32), 5.0, dtype=np.float32)
 
-        B_test = np.random.random((256, 32)).astype(np.int32)
-        B_expected = np.ndarray((256, 32)).astype(np.int32)
-        B_expected.fill(10)
+        B_test = self._get_random_values((256, 32), np.int32)
+        B_expected = np.full((256, 32), 10, dtype=np.int32)
 
         correctness_check_values = {
             "pre": (A_test, B_test),
@@ -390,8 +435,9 @@ class DSLTest_01Arrays(unittest.TestCase):
         package.add(main, args=(arr, ))
 
         package_name = "test_subarray"
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
 
     def test_subarray_l2(self) -> None:
         package = Package()
@@ -431,36 +477,78 @@ class DSLTest_01Arrays(unittest.TestCase):
         package.add(main, args=(arr, ))
 
         package_name = "test_subarray_l2"
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
 
 
 class DSLTest_02SimpleAffineLoopNests(unittest.TestCase):
-    def _create_nest(self, shape: Tuple[int], type=ScalarType.float32) -> Tuple:
+    @classmethod
+    def setUpClass(cls) -> None:
+        # canonical float64 values for the type tests, converted to each element type as needed
+        cls._A64 = _RNG.random((16, 16))
+        cls._B64 = np.ones((16, 16))    # avoid divide by zero
+        cls._C64 = _RNG.random((16, 16))
+
+    def _create_nest(
+        self,
+        shape: Tuple[int],
+        type=ScalarType.float32,
+        layouts=(Array.Layout.FIRST_MAJOR, Array.Layout.FIRST_MAJOR, Array.Layout.FIRST_MAJOR)
+    ) -> Tuple:
         # helper function to create a nest so that we can focus on the logic function
         M, N, S = shape
+        A_layout, B_layout, C_layout = layouts
 
-        A = Array(role=Array.Role.INPUT, element_type=type, shape=(M, S))
-        B = Array(role=Array.Role.INPUT, element_type=type, shape=(S, N))
-        C = Array(role=Array.Role.INPUT_OUTPUT, element_type=type, shape=(M, N))
+        A = Array(role=Array.Role.INPUT, element_type=type, shape=(M, S), layout=A_layout)
+        B = Array(role=Array.Role.INPUT, element_type=type, shape=(S, N), layout=B_layout)
+        C = Array(role=Array.Role.INPUT_OUTPUT, element_type=type, shape=(M, N), layout=C_layout)
 
         return Nest(shape=(M, N, S)), A, B, C
 
-    def _build_nest(self, nest, args: Tuple[Array], package_name, correctness_check_values=None) -> None:
-        # helper function to build a nest so that we can focus on the logic function
-        # create a HAT package and add the nest to it
+    def _build_nests(self, nests: List[Tuple], package_name) -> None:
+        # helper function to build nests so that we can focus on the logic function
+        # each entry of nests is a (nest, args, base_name, correctness_check_values) tuple
+        # create a single HAT package and add all the nests to it, so that the package
+        # build cost is paid once instead of once per nest
         package = Package()
-        function = package.add(nest, args, base_name=package_name)
+        functions = [(package.add(nest, args, base_name=base_name), correctness_check_values)
+                     for nest, args, base_name, correctness_check_values in nests]
 
         # build the HAT package
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR) as v:
-            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
-            if correctness_check_values:
-                v.check_correctness(
-                    function.name, before=correctness_check_values["pre"], after=correctness_check_values["post"]
-                )
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir) as v:
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
+            for function, correctness_check_values in functions:
+                if correctness_check_values:
+                    v.check_correctness(
+                        function.name, before=correctness_check_values["pre"], after=correctness_check_values["post"]
+                    )
+
+    def _create_types_values(self, dtype) -> Tuple:
+        # helper function to create the test values for the type tests
+        A_test = self._A64.astype(dtype)
+        B_test = self._B64.astype(dtype)
+        C_test = self._C64.astype(dtype)
+
+        if np.issubdtype(dtype, np.floating):
+            # (A + B) + (A - B) simplifies to 2A, fusing the reference into a single expression
+            C_ref = C_test + 2 * A_test + A_test * B_test + A_test / B_test
+        else:
+            # keep each operation separate so that integer intermediates wrap around as they do in the function,
+            # computing in-place to avoid allocating a temporary per operation
+            C_ref = C_test.copy()
+            np.add(C_ref, A_test, out=C_ref)
+            np.add(C_ref, B_test, out=C_ref)
+            np.add(C_ref, A_test, out=C_ref)
+            np.subtract(C_ref, B_test, out=C_ref)
+            np.add(C_ref, A_test * B_test, out=C_ref)
+            np.add(C_ref, A_test / B_test, out=C_ref, casting="unsafe")    # truncates the division
+
+        return A_test, B_test, C_test, C_ref
 
     def test_signed_types(self) -> None:
+        nests = []
         for t in [ScalarType.int16, ScalarType.int32, ScalarType.int64] + FLOAT_TYPES:
 
             A = Array(role=Array.Role.INPUT, element_type=t, shape=(16, 16))
@@ -477,16 +565,7 @@ class DSLTest_02SimpleAffineLoopNests(unittest.TestCase):
                 C[i, j] += A[i, j] * B[i, j]
                 C[i, j] += A[i, j] / B[i, j]
 
-            dtype = np.dtype(t.name)
-
-            A_test = np.random.random(A.shape).astype(dtype)
-            B_test = np.ones((C.shape)).astype(dtype)    # avoid divide by zero
-            C_test = np.random.random(C.shape).astype(dtype)
-
-            C_ref = C_test + A_test + B_test
-            C_ref = C_ref + A_test - B_test
-            C_ref = C_ref + A_test * B_test
-            C_ref = C_ref + A_test / B_test
+            A_test, B_test, C_test, C_ref = self._create_types_values(SCALAR_DTYPES[t])
 
             if t == ScalarType.float16:    # TODO: verification issue with correctness check?
                 correctness_check_values = None
@@ -496,9 +575,12 @@ class DSLTest_02SimpleAffineLoopNests(unittest.TestCase):
                     "post": [A_test, B_test, C_ref]
                 }
 
-            self._build_nest(nest, [A, B, C], f"test_types_{t.name}", correctness_check_values)
+            nests.append((nest, [A, B, C], f"test_types_{t.name}", correctness_check_values))
+
+        self._build_nests(nests, "test_signed_types")
 
     def test_unsigned_types(self) -> None:
+        nests = []
         for t in [ScalarType.uint8, ScalarType.uint16, ScalarType.uint32, ScalarType.uint64]:
 
             A = Array(role=Array.Role.INPUT, element_type=t, shape=(16, 16))
@@ -515,24 +597,19 @@ class DSLTest_02SimpleAffineLoopNests(unittest.TestCase):
                 C[i, j] += A[i, j] * B[i, j]
                 C[i, j] += A[i, j] / B[i, j]
 
-            dtype = np.dtype(t.name)
-            A_test = np.random.random(A.shape).astype(dtype)
-            B_test = np.ones((C.shape)).astype(dtype)    # avoid divide by zero
-            C_test = np.random.random(C.shape).astype(dtype)
-
-            C_ref = C_test + A_test + B_test
-            C_ref = C_ref + A_test - B_test
-            C_ref = C_ref + A_test * B_test
-            C_ref = C_ref + A_test / B_test
+            A_test, B_test, C_test, C_ref = self._create_types_values(SCALAR_DTYPES[t])
 
             correctness_check_values = {
                 "pre": [A_test, B_test, C_test],
                 "post": [A_test, B_test, C_ref]
             }
 
-            self._build_nest(nest, [A, B, C], f"test_types_{t.name}", correctness_check_values)
+            nests.append((nest, [A, B, C], f"test_types_{t.name}", correctness_check_values))
+
+        self._build_nests(nests, "test_unsigned_types")
 
     def test_arithmetic_operations(self) -> None:
+        nests = []
         for t in INT_TYPES + FLOAT_TYPES:
             nest, A, B, C = self._create_nest((16, 10, 11), type=t)
             i, j, k = nest.get_indices()
@@ -548,11 +625,14 @@ class DSLTest_02SimpleAffineLoopNests(unittest.TestCase):
                 C[i, j] += A[i, k] % B[k, j]
                 C[i, j] += A[i, k]**B[k, j]
 
-            self._build_nest(nest, [A, B, C], f"test_arithmetic_operations_{t.name}")
+            nests.append((nest, [A, B, C], f"test_arithmetic_operations_{t.name}", None))
+
+        self._build_nests(nests, "test_arithmetic_operations")
 
     def test_relational_operations(self) -> None:
         from accera._lang_python._lang import _If
 
+        nests = []
         for t in [ScalarType.bool] + INT_TYPES + FLOAT_TYPES:
             nest, A, B, C = self._create_nest((16, 10, 11))
             i, j, k = nest.get_indices()
@@ -579,11 +659,14 @@ class DSLTest_02SimpleAffineLoopNests(unittest.TestCase):
                 _If(A[i, k] > B[k, j], f1)
                 _If(A[i, k] >= B[k, j], f2)
 
-            self._build_nest(nest, [A, B, C], f"test_relational_operations_{t.name}")
+            nests.append((nest, [A, B, C], f"test_relational_operations_{t.name}", None))
+
+        self._build_nests(nests, "test_relational_operations")
 
     def test_logical_operations(self) -> None:
         from accera import logical_and, logical_or, logical_not
 
+        nests = []
         for t in [ScalarType.bool] + INT_TYPES:
             nest, A, B, C = self._create_nest((16, 10, 11), type=t)
             i, j, k = nest.get_indices()
@@ -594,9 +677,12 @@ class DSLTest_02SimpleAffineLoopNests(unittest.TestCase):
                 C[i, j] += logical_and(A[i, k], B[k, j])
                 C[i, j] += logical_or(A[i, k], B[k, j])
 
-            self._build_nest(nest, [A, B, C], f"test_logical_operations_{t.name}")
+            nests.append((nest, [A, B, C], f"test_logical_operations_{t.name}", None))
+
+        self._build_nests(nests, "test_logical_operations")
 
     def test_bitwise_operations(self) -> None:
+        nests = []
         for t in INT_TYPES:
             nest, A, B, C = self._create_nest((16, 10, 11), type=t)
             i, j, k = nest.get_indices()
@@ -610,11 +696,14 @@ class DSLTest_02SimpleAffineLoopNests(unittest.TestCase):
                 C[i, j] += A[i, j] ^ B[j, k]
                 C[i, j] += ~A[i, j]
 
-            self._build_nest(nest, [A, B, C], f"test_bitwise_operations_{t.name}")
+            nests.append((nest, [A, B, C], f"test_bitwise_operations_{t.name}", None))
+
+        self._build_nests(nests, "test_bitwise_operations")
 
     def test_intrinsics(self) -> None:
         from accera import max, min
 
+        nests = []
         for t in INT_TYPES + FLOAT_TYPES:
 
             nest, A, B, C = self._create_nest((16, 10, 11), type=t)
@@ -625,40 +714,77 @@ class DSLTest_02SimpleAffineLoopNests(unittest.TestCase):
                 C[i, j] += max(A[i, j], B[j, k])
                 C[i, j] += min(A[i, j], B[j, k])
 
-            self._build_nest(nest, [A, B, C], f"test_intrinsics_{t.name}")
+            nests.append((nest, [A, B, C], f"test_intrinsics_{t.name}", None))
+
+        self._build_nests(nests, "test_intrinsics")
+
+    def _create_intrinsic_nest(self, intrinsic: Callable, use_B: bool, type) -> Tuple:
+        # helper function to create a nest that accumulates a single intrinsic applied to A[i, j] or B[j, k]
+        nest, A, B, C = self._create_nest((16, 10, 11), type=type)
+        i, j, k = nest.get_indices()
+
+        @nest.iteration_logic
+        def _():
+            C[i, j] += intrinsic(B[j, k]) if use_B else intrinsic(A[i, j])
+
+        return nest, A, B, C
 
     def test_intrinsics_float(self) -> None:
         from accera import abs, sqrt, exp, log, log10, log2, sin, cos, ceil, floor, tan, cosh, sinh, tanh
         # from accera._lang_python import fast_exp, fast_exp_mlas
 
-        for t in FLOAT_TYPES:
-
-            nest, A, B, C = self._create_nest((16, 10, 11), type=t)
-            i, j, k = nest.get_indices()
+        types = FLOAT_TYPES if TEST_FP16_INTRINSICS else [t for t in FLOAT_TYPES if t != ScalarType.float16]
+
+        # (intrinsic, whether it is applied to B[j, k] instead of A[i, j])
+        intrinsics = [
+            (abs, False),
+            (exp, False),
+            # (fast_exp, False),
+            # (fast_exp_mlas, False),
+            (log, True),
+            (log2, True),
+            (log10, False),
+            (sin, False),
+            (cos, True),
+            (tan, False),
+            (sqrt, True),
+            (ceil, True),
+            (floor, False),
+            (sinh, False),
+            (cosh, True),
+            (tanh, False),
+        ]
+
+        def create_nests(intrinsics):
+            nests = []
+            for intrinsic, use_B in intrinsics:
+                for t in types:
+                    nest, A, B, C = self._create_intrinsic_nest(intrinsic, use_B, t)
+                    nests.append((nest, [A, B, C], f"test_intrinsics_float_{intrinsic.__name__}_{t.name}", None))
+            return nests
+
+        try:
+            self._build_nests(create_nests(intrinsics), "test_intrinsics_float")
+        except Exception:
+            # a failure of the combined package does not say which intrinsic is at fault,
+            # so rebuild each intrinsic in its own package to attribute it
+            for intrinsic, use_B in intrinsics:
+                with self.subTest(intrinsic=intrinsic.__name__):
+                    self._build_nests(
+                        create_nests([(intrinsic, use_B)]), f"test_intrinsics_float_{intrinsic.__name__}"
+                    )
+            raise
 
-            @nest.iteration_logic
-            def _():
-                C[i, j] += abs(A[i, j])
-                C[i, j] += exp(A[i, j])
-                # C[i, j] += fast_exp(A[i, j])
-                # C[i, j] += fast_exp_mlas(A[i, j])
-                C[i, j] += log(B[j, k])
-                C[i, j] += log2(B[j, k])
-                C[i, j] += log10(A[i, j])
-                C[i, j] += sin(A[i, j])
-                C[i, j] += cos(B[j, k])
-                C[i, j] += tan(A[i, j])
-                C[i, j] += sqrt(B[j, k])
-                C[i, j] += ceil(B[j, k])
-                C[i, j] += floor(A[i, j])
-                C[i, j] += sinh(A[i, j])
-                C[i, j] += cosh(B[j, k])
-                C[i, j] += tanh(A[i, j])
-
-            self._build_nest(nest, [A, B, C], f"test_intrinsics_float_{t.name}")
+        if not TEST_FP16_INTRINSICS:
+            # report the float16 coverage that was skipped, rather than dropping it silently
+            with self.subTest(dtype=ScalarType.float16.name):
+                self.skipTest("float16 intrinsics are slow to build, set ACCERA_TEST_FP16=1 to test them")
 
     def test_convenience_syntax_1(self) -> None:
-        nest, A, B, C = self._create_nest((16, 10, 11))
+        # B is last-major so that the innermost index (k) accesses both A and B with unit stride
+        nest, A, B, C = self._create_nest(
+            (16, 10, 11), layouts=(Array.Layout.FIRST_MAJOR, Array.Layout.LAST_MAJOR, Array.Layout.FIRST_MAJOR)
+        )
         i, j, k = nest.get_indices()
 
         @nest.iteration_logic
@@ -666,15 +792,19 @@ class DSLTest_02SimpleAffineLoopNests(unittest.TestCase):
             C[i, j] += A[i, k] + B[k, j]
 
         package = Package()
-        package_name = "test_convenience_syntax_2"
+        package_name = "test_convenience_syntax_1"
         package.add(nest, args=(A, B, C), base_name="matmul")
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
 
     def test_convenience_syntax_2(self) -> None:
 
-        nest, A, B, C = self._create_nest((16, 10, 11))
+        # B is last-major so that the innermost index (k) accesses both A and B with unit stride
+        nest, A, B, C = self._create_nest(
+            (16, 10, 11), layouts=(Array.Layout.FIRST_MAJOR, Array.Layout.LAST_MAJOR, Array.Layout.FIRST_MAJOR)
+        )
         i, j, k = nest.get_indices()
 
         @nest.iteration_logic
@@ -687,8 +817,9 @@ class DSLTest_02SimpleAffineLoopNests(unittest.TestCase):
         package_name = "test_convenience_syntax_2"
         package.add(plan, args=(A, B, C), base_name="matmul")
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
 
 
 class DSLTest_03Schedules(unittest.TestCase):
@@ -701,20 +832,42 @@ class DSLTest_03Schedules(unittest.TestCase):
 
         return Nest(shape=(M, N, S)), A, B, C
 
+    _skew_references = {}
+
+    @classmethod
+    def _get_skew_reference(cls, N: int, K: int) -> dict:
+        # helper function to create the correctness check values for the skew tests, which compute
+        # C[i] += A[i + j] * B[j] for an N-element input A and a K-element filter B
+        # the values are created once per (N, K) and shared by the i-vs-j and j-vs-i skews
+        key = (N, K)
+        if key not in cls._skew_references:
+            A_test = _random_float32((N, ))
+            B_test = _random_float32((K, ))
+            C_test = _random_float32((N - K + 1, ))
+            C_ref = C_test + _sliding_windows(A_test, K) @ B_test
+            cls._skew_references[key] = {"pre": [A_test, B_test, C_test], "post": [A_test, B_test, C_ref]}
+        return cls._skew_references[key]
+
     def _verify_schedule(self, schedule, args: Tuple[Array], package_name, correctness_check_values=None) -> None:
+        self._verify_schedules([(schedule, args, "schedule_test", correctness_check_values)], package_name)
 
-        # create a HAT package and add the function to it
+    def _verify_schedules(self, schedules: List[Tuple], package_name) -> None:
+        # each entry of schedules is a (schedule, args, base_name, correctness_check_values) tuple
+
+        # create a HAT package and add the functions to it
         package = Package()
-        function = package.add(schedule, args, base_name="schedule_test")
+        functions = [(package.add(schedule, args, base_name=base_name), correctness_check_values)
+                     for schedule, args, base_name, correctness_check_values in schedules]
         output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
 
         # build the HAT package
         with verifiers.VerifyPackage(self, package_name, output_dir) as v:
             package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
-            if correctness_check_values:
-                v.check_correctness(
-                    function.name, before=correctness_check_values["pre"], after=correctness_check_values["post"]
-                )
+            for function, correctness_check_values in functions:
+                if correctness_check_values:
+                    v.check_correctness(
+                        function.name, before=correctness_check_values["pre"], after=correctness_check_values["post"]
+                    )
 
     def test_schedule_reorder(self) -> None:
         nest, A, B, C = self._create_nest((16, 10, 11))
@@ -748,28 +901,30 @@ class DSLTest_03Schedules(unittest.TestCase):
         for index in [ii, iii, iiii]:
             self.assertIsNotNone(index)
         self.assertEqual(schedule._indices, [i, iii, ii, iiii, j, k])
-        self._verify_schedule(schedule, [A, B, C], "test_schedule_split1")
 
         # split size does not divide the dimension size
         schedule2 = nest.create_schedule()
         kk = schedule2.split(k, 4)    # original size of dimension k was 11
         self.assertIsNotNone(kk)
         self.assertEqual(schedule2._indices, [i, j, k, kk])
-        self._verify_schedule(schedule2, [A, B, C], "test_schedule_split2")
 
         # split size == dimension size
         schedule3 = nest.create_schedule()
         kk = schedule3.split(k, 11)    # original size of dimension k was 11
         self.assertIsNotNone(kk)
         self.assertEqual(schedule3._indices, [i, j, k, kk])
-        self._verify_schedule(schedule3, [A, B, C], "test_schedule_split3")
 
         # split size > dimension size
         schedule4 = nest.create_schedule()
         kk = schedule4.split(k, 13)    # original size of dimension k was 11
         self.assertIsNotNone(kk)
         self.assertEqual(schedule4._indices, [i, j, k, kk])
-        self._verify_schedule(schedule4, [A, B, C], "test_schedule_split4")
+
+        # build the split schedules into a single package
+        self._verify_schedules([(schedule, [A, B, C], "test_schedule_split1", None),
+                                (schedule2, [A, B, C], "test_schedule_split2", None),
+                                (schedule3, [A, B, C], "test_schedule_split3", None),
+                                (schedule4, [A, B, C], "test_schedule_split4", None)], "test_schedule_split")
 
     def test_schedule_set_invalid_order(self) -> None:
         nest, A, B, C = self._create_nest((16, 10, 11))
@@ -814,7 +969,6 @@ class DSLTest_03Schedules(unittest.TestCase):
         self.assertIsNotNone(jj)
         self.assertIsNotNone(kk)
         self.assertEqual(schedule._indices, [i, ii, j, jj, k, kk])
-        self._verify_schedule(schedule, [A, B, C], "test_schedule_tile")
 
         # tile a subset of the iteration space
         schedule1 = nest.create_schedule()
@@ -825,9 +979,12 @@ class DSLTest_03Schedules(unittest.TestCase):
         self.assertIsNotNone(iii)
         self.assertIsNotNone(kkk)
         self.assertEqual(schedule1._indices, [i, iii, j, k, kkk])
-        self._verify_schedule(schedule1, [A, B, C], "test_schedule_tile_subset")
+
+        self._verify_schedules([(schedule, [A, B, C], "tile", None), (schedule1, [A, B, C], "tile_subset", None)],
+                               "test_schedule_tile")
 
     def test_schedule_skew(self) -> None:
+        schedules = []
         for N in [10, 224]:    # input sizes
             for K in [1, 3, 5]:    # filter sizes
                 M = N - K + 1    # output size
@@ -845,22 +1002,19 @@ class DSLTest_03Schedules(unittest.TestCase):
 
                 schedule = nest.create_schedule()
 
-                A_test = np.random.random(A.shape).astype(np.float32)
-                B_test = np.random.random(B.shape).astype(np.float32)
-                C_test = np.random.random(C.shape).astype(np.float32)
-                correctness_check_values = {
-                    "pre": [A_test, B_test, C_test],
-                    "post": [A_test, B_test, C_test + np.convolve(np.flip(B_test), A_test, "valid")]
-                }
+                correctness_check_values = self._get_skew_reference(N, K)
 
                 # Skew dimension i with respect to dimension j.
                 schedule.skew(i, j)
-                self._verify_schedule(schedule, [A, B, C], f"test_schedule_skew_i_j_{N}_{K}", correctness_check_values)
+                schedules.append((schedule, [A, B, C], f"test_schedule_skew_i_j_{N}_{K}", correctness_check_values))
 
                 # Skew dimension j with respect to dimension i.
                 schedule1 = nest.create_schedule()
                 schedule1.skew(j, i)
-                self._verify_schedule(schedule1, [A, B, C], f"test_schedule_skew_j_i_{N}_{K}", correctness_check_values)
+                schedules.append((schedule1, [A, B, C], f"test_schedule_skew_j_i_{N}_{K}", correctness_check_values))
+
+        # the sweep is independent per (N, K), so build it as a single package
+        self._verify_schedules(schedules, "test_schedule_skew")
 
     def test_schedule_skew_unrolling(self) -> None:
         N = 10    # input size
@@ -878,13 +1032,7 @@ class DSLTest_03Schedules(unittest.TestCase):
         def _():
             C[i] += A[i + j] * B[j]
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
-        C_test = np.random.random(C.shape).astype(np.float32)
-        correctness_check_values = {
-            "pre": [A_test, B_test, C_test],
-            "post": [A_test, B_test, C_test + np.convolve(np.flip(B_test), A_test, "valid")]
-        }
+        correctness_check_values = self._get_skew_reference(N, K)
 
         # Skew dimension i with respect to dimension j, with unrolling.
         schedule = nest.create_schedule()
@@ -928,12 +1076,14 @@ class DSLTest_03Schedules(unittest.TestCase):
 
         schedule.reorder(i, ii, k, j, jj, kk)
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
-        C_test = np.random.random(C.shape).astype(np.float32)
+        A_test = _random_float32(A.shape)
+        B_test = _random_float32(B.shape)
+        C_test = _random_float32(C.shape)
+        C_ref = A_test @ B_test
+        C_ref += C_test
         correctness_check_values = {
             "pre": [A_test, B_test, C_test],
-            "post": [A_test, B_test, C_test + A_test @ B_test]
+            "post": [A_test, B_test, C_ref]
         }
         self._verify_schedule(schedule, [A, B, C], "test_schedule_pad", correctness_check_values)
 
@@ -952,8 +1102,9 @@ class DSLTest_03Schedules(unittest.TestCase):
         package_name = "test_convenience_syntax"
         package.add(schedule, args=(A, B, C), base_name="plan_test")
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
 
 
 class DSLTest_04Fusing(unittest.TestCase):
@@ -1004,9 +1155,9 @@ class DSLTest_04Fusing(unittest.TestCase):
 
         schedule.reorder(i, j, f)
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
-        C_test = np.random.random(C.shape).astype(np.float32)
+        A_test = _random_float32(A.shape)
+        B_test = _random_float32(B.shape)
+        C_test = _random_float32(C.shape)
         correctness_check_values = {
             "pre": [A_test, B_test, C_test],
             "post": [A_test, B_test, (C_test + A_test) * B_test]
@@ -1063,12 +1214,15 @@ class DSLTest_04Fusing(unittest.TestCase):
             schedule.reorder(i, j, k, f)
         self.assertEqual(schedule._indices, [i, j, f, k])
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
-        C_test = np.random.random(C.shape).astype(np.float32)
+        A_test = _random_float32(A.shape)
+        B_test = _random_float32(B.shape)
+        C_test = _random_float32(C.shape)
+        C_ref = A_test @ B_test
+        C_ref += C_test
+        np.maximum(C_ref, 0., out=C_ref)
         correctness_check_values = {
             "pre": [A_test, B_test, C_test],
-            "post": [A_test, B_test, np.maximum(C_test + A_test @ B_test, 0.)]
+            "post": [A_test, B_test, C_ref]
         }
         self._verify_schedule(schedule, (A, B, C), "test_partial_iteration_space_fusing_1", correctness_check_values)
 
@@ -1101,8 +1255,8 @@ class DSLTest_04Fusing(unittest.TestCase):
         jj = fs.split(j, 2)
         fs.reorder(i, f, j, jj)
 
-        A_test_pre = np.random.random(A.shape).astype(np.float32)
-        B_test_pre = np.random.random(B.shape).astype(np.float32)
+        A_test_pre = _random_float32(A.shape)
+        B_test_pre = _random_float32(B.shape)
         A_test_post = A_test_pre * A_test_pre
         B_test_post = B_test_pre + np.sum(A_test_post)
         correctness_check_values = {
@@ -1159,12 +1313,15 @@ class DSLTest_04Fusing(unittest.TestCase):
         #         if f == 0:
         #           C[i, j] += A[i, j]
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
-        C_test = np.random.random(C.shape).astype(np.float32)
+        A_test = _random_float32(A.shape)
+        B_test = _random_float32(B.shape)
+        C_test = _random_float32(C.shape)
 
-        C_ref = C_test + A_test    # nest0
-        C_ref[:, :B.shape[1]] = C_ref[:, :B.shape[1]] * B_test    # nest1
+        # compute each region of the fused iteration space in a single pass
+        n = B.shape[1]
+        C_ref = np.empty_like(C_test)
+        C_ref[:, :n] = (C_test[:, :n] + A_test[:, :n]) * B_test    # nest0 then nest1
+        C_ref[:, n:] = C_test[:, n:] + A_test[:, n:]    # nest0 only
 
         correctness_check_values = {
             "pre": [A_test, B_test, C_test],
@@ -1219,13 +1376,15 @@ class DSLTest_04Fusing(unittest.TestCase):
         #         if f == 1:
         #           C[i, j] *= B[i, j]
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
-        C_test = np.random.random(C.shape).astype(np.float32)
-        C_ref = np.copy(C_test)
+        A_test = _random_float32(A.shape)
+        B_test = _random_float32(B.shape)
+        C_test = _random_float32(C.shape)
 
-        C_ref[:, :A.shape[1]] = C_test[:, :A.shape[1]] + A_test    # nest0
-        C_ref *= B_test    # nest1
+        # compute each region of the fused iteration space in a single pass
+        n = A.shape[1]
+        C_ref = np.empty_like(C_test)
+        C_ref[:, :n] = (C_test[:, :n] + A_test) * B_test[:, :n]    # nest0 then nest1
+        C_ref[:, n:] = C_test[:, n:] * B_test[:, n:]    # nest1 only
 
         correctness_check_values = {
             "pre": [A_test, B_test, C_test],
@@ -1308,12 +1467,15 @@ class DSLTest_04Fusing(unittest.TestCase):
         #               for ii in range(0, 4):
         #                   C[i+ii, j] += A[i+ii, j]
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
-        C_test = np.random.random(C.shape).astype(np.float32)
+        A_test = _random_float32(A.shape)
+        B_test = _random_float32(B.shape)
+        C_test = _random_float32(C.shape)
 
-        C_ref = C_test + A_test    # nest0
-        C_ref[:, :B.shape[1]] = C_ref[:, :B.shape[1]] * B_test    # nest1
+        # compute each region of the fused iteration space in a single pass
+        n = B.shape[1]
+        C_ref = np.empty_like(C_test)
+        C_ref[:, :n] = (C_test[:, :n] + A_test[:, :n]) * B_test    # nest0 then nest1
+        C_ref[:, n:] = C_test[:, n:] + A_test[:, n:]    # nest0 only
 
         correctness_check_values = {
             "pre": [A_test, B_test, C_test],
@@ -1353,8 +1515,8 @@ class DSLTest_04Fusing(unittest.TestCase):
         #         for i in range(7):
         #             B[i] *= B[i]
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
+        A_test = _random_float32(A.shape)
+        B_test = _random_float32(B.shape)
 
         A_ref = A_test / A_test
         B_ref = B_test * B_test
@@ -1409,9 +1571,9 @@ class DSLTest_04Fusing(unittest.TestCase):
         #         for i in range(5):
         #           C[i}] /= C[i}]
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
-        C_test = np.random.random(C.shape).astype(np.float32)
+        A_test = _random_float32(A.shape)
+        B_test = _random_float32(B.shape)
+        C_test = _random_float32(C.shape)
 
         A_ref = A_test + A_test
         B_ref = B_test * B_test
@@ -1457,8 +1619,8 @@ class DSLTest_04Fusing(unittest.TestCase):
         #             for j in range(16):
         #                 B[i,j] *= B[i,j]
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
+        A_test = _random_float32(A.shape)
+        B_test = _random_float32(B.shape)
 
         A_ref = A_test / A_test
         B_ref = B_test * B_test
@@ -1516,9 +1678,9 @@ class DSLTest_04Fusing(unittest.TestCase):
         #             for j in range(16):
         #                 C[i,j] /= C[i,j]
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
-        C_test = np.random.random(C.shape).astype(np.float32)
+        A_test = _random_float32(A.shape)
+        B_test = _random_float32(B.shape)
+        C_test = _random_float32(C.shape)
 
         A_ref = A_test + A_test
         B_ref = B_test * B_test
@@ -1583,10 +1745,10 @@ class DSLTest_04Fusing(unittest.TestCase):
         s3.split(i3, 7)
         fused3 = fuse([fused2, s3], partial=0)
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
-        C_test = np.random.random(C.shape).astype(np.float32)
-        D_test = np.random.random(D.shape).astype(np.float32)
+        A_test = _random_float32(A.shape)
+        B_test = _random_float32(B.shape)
+        C_test = _random_float32(C.shape)
+        D_test = _random_float32(D.shape)
         correctness_check_values = {
             "pre": [A_test, B_test, C_test, D_test],
             "post": [A_test + A_test, B_test * B_test, C_test * C_test, D_test * D_test]
@@ -1665,6 +1827,57 @@ class DSLTest_06PlansCaching(unittest.TestCase):
 
         return plan, [A, B, C], [i, j, k]
 
+    def _create_tiled_matmul_plan(self) -> Tuple:
+        # helper function to create a tiled 1024x1024x1024 matmul plan, shared by the cache trigger tests
+        # returns the indices in their scheduled order
+        M = 1024
+        N = 1024
+        S = 1024
+
+        A = Array(role=Array.Role.INPUT, shape=(M, S))
+        B = Array(role=Array.Role.INPUT, shape=(S, N))
+        C = Array(role=Array.Role.INPUT_OUTPUT, shape=(M, N))
+
+        nest = Nest(shape=(M, N, S))
+        i, j, k = nest.get_indices()
+
+        @nest.iteration_logic
+        def _():
+            C[i, j] += A[i, k] * B[k, j]
+
+        schedule = nest.create_schedule()
+
+        jj = schedule.split(j, 128)
+        kk = schedule.split(k, 256)
+        kkk = schedule.split(kk, 4)
+        jjj = schedule.split(jj, 16)
+        jjjj = schedule.split(jjj, 8)
+        ii = schedule.split(i, 6)
+
+        schedule.reorder(j, k, i, jj, kk, kkk, ii, jjj, jjjj)
+        plan = schedule.create_plan()
+
+        return plan, [A, B, C], [j, k, i, jj, kk, kkk, ii, jjj, jjjj]
+
+    _matmul_references = {}
+
+    @classmethod
+    def _get_matmul_reference(cls, M: int, N: int, S: int) -> dict:
+        # helper function to create the correctness check values of C += A @ B for (M, S) x (S, N) inputs
+        # the values are created once per shape and shared by the tests, as the reference matmul is expensive
+        key = (M, N, S)
+        if key not in cls._matmul_references:
+            A_test = _random_float32((M, S))
+            B_test = _random_float32((S, N))
+            C_test = _random_float32((M, N))
+            C_ref = A_test @ B_test
+            C_ref += C_test
+            cls._matmul_references[key] = {
+                "pre": [A_test, B_test, C_test],
+                "post": [A_test, B_test, C_ref]
+            }
+        return cls._matmul_references[key]
+
     def _verify_plan(self, plan, args: Tuple[Array], package_name, correctness_check_values=None) -> None:
         # create a HAT package and add the function to it
         package = Package()
@@ -1778,73 +1991,21 @@ class DSLTest_06PlansCaching(unittest.TestCase):
         self._verify_plan(plan, [A, B], "test_cache_trigger_level")
 
     def test_cache_trigger_level_matmul(self) -> None:
-        M = 1024
-        N = 1024
-        S = 1024
-
-        A = Array(role=Array.Role.INPUT, shape=(M, S))
-        B = Array(role=Array.Role.INPUT, shape=(S, N))
-        C = Array(role=Array.Role.INPUT_OUTPUT, shape=(M, N))
-
-        nest = Nest(shape=(M, N, S))
-        i, j, k = nest.get_indices()
-
-        @nest.iteration_logic
-        def _():
-            C[i, j] += A[i, k] * B[k, j]
-
-        schedule = nest.create_schedule()
-
-        jj = schedule.split(j, 128)
-        kk = schedule.split(k, 256)
-        kkk = schedule.split(kk, 4)
-        jjj = schedule.split(jj, 16)
-        jjjj = schedule.split(jjj, 8)
-        ii = schedule.split(i, 6)
+        plan, args, indices = self._create_tiled_matmul_plan()
+        A, B, C = args
+        _, k, _, _, _, kkk, _, _, _ = indices
 
-        schedule.reorder(j, k, i, jj, kk, kkk, ii, jjj, jjjj)
-        plan = schedule.create_plan()
         plan.cache(B, index=kkk, trigger_index=k, layout=Array.Layout.FIRST_MAJOR)
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
-        C_test = np.random.random(C.shape).astype(np.float32)
-        correctness_check_values = {
-            "pre": [A_test, B_test, C_test],
-            "post": [A_test, B_test, C_test + A_test @ B_test]
-        }
+        correctness_check_values = self._get_matmul_reference(1024, 1024, 1024)
 
         self._verify_plan(
             plan, [A, B, C], "test_cache_trigger_level_matmul", correctness_check_values=correctness_check_values
         )
 
     def test_hierachical_caching(self) -> None:
-        M = 1024
-        N = 1024
-        S = 1024
-
-        A = Array(role=Array.Role.INPUT, shape=(M, S))
-        B = Array(role=Array.Role.INPUT, shape=(S, N))
-        C = Array(role=Array.Role.INPUT_OUTPUT, shape=(M, N))
-
-        nest = Nest(shape=(M, N, S))
-        i, j, k = nest.get_indices()
-
-        @nest.iteration_logic
-        def _():
-            C[i, j] += A[i, k] * B[k, j]
-
-        schedule = nest.create_schedule()
-
-        jj = schedule.split(j, 128)
-        kk = schedule.split(k, 256)
-        kkk = schedule.split(kk, 4)
-        jjj = schedule.split(jj, 16)
-        jjjj = schedule.split(jjj, 8)
-        ii = schedule.split(i, 6)
-
-        schedule.reorder(j, k, i, jj, kk, kkk, ii, jjj, jjjj)
-        plan = schedule.create_plan()
+        plan, args, _ = self._create_tiled_matmul_plan()
+        A, B, C = args
 
         AA = plan.cache(A, level=5, trigger_level=7, layout=Array.Layout.FIRST_MAJOR)
         AAA = plan.cache(AA, level=3, trigger_level=5, layout=Array.Layout.LAST_MAJOR)
@@ -1853,13 +2014,7 @@ class DSLTest_06PlansCaching(unittest.TestCase):
         CC = plan.cache(C, level=8, layout=Array.Layout.FIRST_MAJOR)
         CCC = plan.cache(CC, level=6, layout=Array.Layout.LAST_MAJOR)
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
-        C_test = np.random.random(C.shape).astype(np.float32)
-        correctness_check_values = {
-            "pre": [A_test, B_test, C_test],
-            "post": [A_test, B_test, C_test + A_test @ B_test]
-        }
+        correctness_check_values = self._get_matmul_reference(1024, 1024, 1024)
 
         self._verify_plan(
             plan, [A, B, C], "test_hierarchical_caching", correctness_check_values=correctness_check_values
@@ -1868,16 +2023,24 @@ class DSLTest_06PlansCaching(unittest.TestCase):
 
 class DSLTest_07PlansVectorizationParallelization(unittest.TestCase):
     def _verify_plan(self, plan, args: Tuple[int], package_name, correctness_check_values=None) -> None:
+        self._verify_plans([(plan, args, "vectorization_parallelization_test", correctness_check_values)],
+                           package_name)
+
+    def _verify_plans(self, plans: List[Tuple], package_name) -> None:
+        # each entry of plans is a (plan, args, base_name, correctness_check_values) tuple
+        # independent plans are built as functions of a single package, so that the build cost is paid once
         package = Package()
-        function = package.add(plan, args, base_name="vectorization_parallelization_test")
+        functions = [(package.add(plan, args, base_name=base_name), correctness_check_values)
+                     for plan, args, base_name, correctness_check_values in plans]
 
         output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
         with verifiers.VerifyPackage(self, package_name, output_dir) as v:
             package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
-            if correctness_check_values:
-                v.check_correctness(
-                    function.name, before=correctness_check_values["pre"], after=correctness_check_values["post"]
-                )
+            for function, correctness_check_values in functions:
+                if correctness_check_values:
+                    v.check_correctness(
+                        function.name, before=correctness_check_values["pre"], after=correctness_check_values["post"]
+                    )
 
     def test_unroll(self) -> None:
         from accera import Target, Nest
@@ -1895,11 +2058,11 @@ class DSLTest_07PlansVectorizationParallelization(unittest.TestCase):
 
         plan1 = nest.create_plan(my_target)
         plan1.unroll(index=j)
-        self._verify_plan(plan1, [A], "test_unroll1")
 
         plan2 = nest.create_plan(my_target)
         plan2.unroll(index=i)
-        self._verify_plan(plan2, [A], "test_unroll2")
+
+        self._verify_plans([(plan1, [A], "unroll1", None), (plan2, [A], "unroll2", None)], "test_unroll")
 
     def test_vectorize(self) -> None:
         from accera import Target, Nest
@@ -1919,7 +2082,15 @@ class DSLTest_07PlansVectorizationParallelization(unittest.TestCase):
 
         plan = nest.create_plan(my_target)
         plan.vectorize(index=i)
-        self._verify_plan(plan, [A, B, C], "test_vectorize")
+
+        A_test = _random_float32(A.shape)
+        B_test = _random_float32(B.shape)
+        C_test = _random_float32(C.shape)
+        correctness_check_values = {
+            "pre": [A_test, B_test, C_test],
+            "post": [A_test, B_test, np.multiply(A_test, B_test)]
+        }
+        self._verify_plan(plan, [A, B, C], "test_vectorize", correctness_check_values)
 
     def test_kernelize(self) -> None:
         from accera import Target, Nest
@@ -2041,24 +2212,12 @@ class DSLTest_07PlansVectorizationParallelization(unittest.TestCase):
 
         target = Target("HOST", num_threads=16)
 
-        # disable correctness checking on windows because the
-        # install location of libomp.dll is non-standard as of now
-        if sys.platform.startswith('win'):
-            correctness_check_values = None
-        else:
-            A_test = np.random.random(A.shape).astype(np.float32)
-            B_test = np.random.random(B.shape).astype(np.float32)
-            C_test = np.random.random(C.shape).astype(np.float32)
-            correctness_check_values = {
-                "pre": [A_test, B_test, C_test],
-                "post": [A_test, B_test, C_test + A_test @ B_test]
-            }
-
         schedule = nest.create_schedule()
         ii = schedule.split(i, A.shape[0] // min(4, target.num_threads))
         # set the index (k) that cannot be parallelized as innermost
         schedule.reorder(i, ii, j, k)
 
+        plans = []
         for policy in ["static", "dynamic"]:
             plan = schedule.create_plan(target)
 
@@ -2072,30 +2231,57 @@ class DSLTest_07PlansVectorizationParallelization(unittest.TestCase):
 
             # non-collapsed
             plan.parallelize(indices=i, policy=policy)
-            self._verify_plan(plan, [A, B, C], f"test_parallelize_i_{policy}", correctness_check_values)
+            plans.append((plan, f"parallelize_i_{policy}"))
 
             # parallelizing middle index
             plan_ii = schedule.create_plan(target)
             plan_ii.parallelize(indices=ii, policy=policy)
-            self._verify_plan(plan_ii, [A, B, C], f"test_parallelize_ii_{policy}", correctness_check_values)
+            plans.append((plan_ii, f"parallelize_ii_{policy}"))
 
             # partial collapsed
             plan_partial = schedule.create_plan(target)
             plan_partial.parallelize(indices=(i, ii, j), policy=policy)
-            self._verify_plan(plan_partial, [A, B, C], f"test_parallelize_i_ii_j_{policy}", correctness_check_values)
+            plans.append((plan_partial, f"parallelize_i_ii_j_{policy}"))
 
             # partial collapsed inner indices
             plan_partial_inner = schedule.create_plan(target)
             plan_partial_inner.parallelize(indices=(ii, j), policy=policy)
-            self._verify_plan(
-                plan_partial_inner, [A, B, C], f"test_parallelize_ii_j_{policy}", correctness_check_values
-            )
+            plans.append((plan_partial_inner, f"parallelize_ii_j_{policy}"))
 
             # fully collapsed will result in correctness issues because parallelizing k can stomp on the C matrix
             # where multiple threads try to update C[i, j] for different values of k
 
+        # create the reference only after the invalid parallelizations above have been rejected
+        # disable correctness checking on windows because the
+        # install location of libomp.dll is non-standard as of now
+        if sys.platform.startswith('win'):
+            correctness_check_values = None
+        else:
+            A_test = _random_float32(A.shape)
+            B_test = _random_float32(B.shape)
+            C_test = _random_float32(C.shape)
+            C_ref = A_test @ B_test
+            C_ref += C_test
+            correctness_check_values = {
+                "pre": [A_test, B_test, C_test],
+                "post": [A_test, B_test, C_ref]
+            }
+
+        self._verify_plans([(plan, [A, B, C], base_name, correctness_check_values) for plan, base_name in plans],
+                           "test_scheduling_strategies")
+
 
 class DSLTest_08DeferredLayout(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # constant data and values shared by the tests, as the reference is independent of the layout
+        cls._matrix = _random_float32((128, 128))
+        B_test = _random_float32(cls._matrix.shape)
+        cls._correctness_check_values = {
+            "pre": [B_test],
+            "post": [B_test + cls._matrix]
+        }
+
     def _verify_package(self, plan, args, package_name, correctness_check_values) -> None:
         package = Package()
         function = package.add(plan, args, base_name="deferred_layout")
@@ -2109,74 +2295,70 @@ class DSLTest_08DeferredLayout(unittest.TestCase):
                 )
 
     def test_deferred_layout_predefined(self) -> None:
-        matrix = np.random.rand(128, 128).astype(np.float32)
-        B_test = np.random.random(matrix.shape).astype(np.float32)
+        matrix = self._matrix
+        correctness_check_values = self._correctness_check_values
 
         for layout in [Array.Layout.FIRST_MAJOR, Array.Layout.LAST_MAJOR]:
-            A = Array(role=Array.Role.CONST, data=matrix, layout=Array.Layout.DEFERRED)
-            B = Array(role=Array.Role.INPUT_OUTPUT, element_type=ScalarType.float32, shape=matrix.shape)
+            with self.subTest(layout=layout):
+                A = Array(role=Array.Role.CONST, data=matrix, layout=Array.Layout.DEFERRED)
+                B = Array(role=Array.Role.INPUT_OUTPUT, element_type=ScalarType.float32, shape=matrix.shape)
 
-            nest = Nest(shape=matrix.shape)
-            i, j = nest.get_indices()
+                nest = Nest(shape=matrix.shape)
+                i, j = nest.get_indices()
 
-            @nest.iteration_logic
-            def _():
-                B[i, j] += A[i, j]
+                @nest.iteration_logic
+                def _():
+                    B[i, j] += A[i, j]
 
-            # create a cache for the constant array
-            plan1 = nest.create_plan()
-            AA = plan1.cache(A, i, layout=layout)    # , thrifty=True) # TODO
+                # create a cache for the constant array
+                plan1 = nest.create_plan()
+                AA = plan1.cache(A, i, layout=layout)    # , thrifty=True) # TODO
 
-            # create another cache, using a different plan, for testing purposes
-            plan2 = nest.create_plan()
-            BB = plan2.cache(B, i)
+                # create another cache, using a different plan, for testing purposes
+                plan2 = nest.create_plan()
+                BB = plan2.cache(B, i)
 
-            with self.assertRaises(ValueError):
-                B.deferred_layout(cache=BB)    # non-const array
+                with self.assertRaises(ValueError):
+                    B.deferred_layout(cache=BB)    # non-const array
 
-            with self.assertRaises(ValueError):
-                A.deferred_layout(cache=BB)    # wrong cache
+                with self.assertRaises(ValueError):
+                    A.deferred_layout(cache=BB)    # wrong cache
 
-            # update the constant array's layout based on the cache
-            A.deferred_layout(cache=AA)
-            self.assertEqual(A.layout, AA.layout)
+                # update the constant array's layout based on the cache
+                A.deferred_layout(cache=AA)
+                self.assertEqual(A.layout, AA.layout)
 
-            with self.assertRaises(ValueError):
-                A.deferred_layout(cache=AA)    # duplicate
+                with self.assertRaises(ValueError):
+                    A.deferred_layout(cache=AA)    # duplicate
 
-            package_name = f"test_deferred_layout_predefined_{layout}".replace(".", "_")    # sanitize path name
+                package_name = f"test_deferred_layout_predefined_{layout}".replace(".", "_")    # sanitize path name
 
-            self._verify_package(plan1, (B, ), package_name, {
-                "pre": [B_test],
-                "post": [B_test + matrix]
-            })
+                self._verify_package(plan1, (B, ), package_name, correctness_check_values)
 
     def test_deferred_layout_coefficients(self) -> None:
-        matrix = np.random.rand(128, 128).astype(np.float32)
-        B_test = np.random.random(matrix.shape).astype(np.float32)
+        matrix = self._matrix
+        correctness_check_values = self._correctness_check_values
 
         for layout in [(128, 1), (1, 128)]:
-            A = Array(role=Array.Role.CONST, data=matrix, layout=Array.Layout.DEFERRED)
-            B = Array(role=Array.Role.INPUT_OUTPUT, element_type=ScalarType.float32, shape=matrix.shape)
+            with self.subTest(layout=layout):
+                A = Array(role=Array.Role.CONST, data=matrix, layout=Array.Layout.DEFERRED)
+                B = Array(role=Array.Role.INPUT_OUTPUT, element_type=ScalarType.float32, shape=matrix.shape)
 
-            nest = Nest(shape=matrix.shape)
-            i, j = nest.get_indices()
+                nest = Nest(shape=matrix.shape)
+                i, j = nest.get_indices()
 
-            @nest.iteration_logic
-            def _():
-                B[i, j] += A[i, j]
+                @nest.iteration_logic
+                def _():
+                    B[i, j] += A[i, j]
 
-            plan = nest.create_plan()
-            AA = plan.cache(A, i, layout=layout)    # , thrifty=True) # TODO
+                plan = nest.create_plan()
+                AA = plan.cache(A, i, layout=layout)    # , thrifty=True) # TODO
 
-            A.deferred_layout(cache=AA)
-            self.assertEqual(A.layout, AA.layout)
+                A.deferred_layout(cache=AA)
+                self.assertEqual(A.layout, AA.layout)
 
-            package_name = f"test_deferred_layout_coefficients_{'_'.join(map(str, layout))}"
-            self._verify_package(plan, (B, ), package_name, {
-                "pre": [B_test],
-                "post": [B_test + matrix]
-            })
+                package_name = f"test_deferred_layout_coefficients_{'_'.join(map(str, layout))}"
+                self._verify_package(plan, (B, ), package_name, correctness_check_values)
 
 
 class DSLTest_09Parameters(unittest.TestCase):
@@ -2246,8 +2428,9 @@ class DSLTest_09Parameters(unittest.TestCase):
             base_name="alternative_matmul_16_16_16"
         )
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(name=package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(name=package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
 
     def test_parameterization_2(self) -> None:
         from accera import create_parameters, Nest
@@ -2302,12 +2485,16 @@ class DSLTest_09Parameters(unittest.TestCase):
             base_name="matmul_256_256_256"
         )
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(name=package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(name=package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
 
     def test_parameterization_3(self) -> None:
         from accera import create_parameters, Nest
 
+        # create a HAT package and add a function to it for each (N, K)
+        package = Package()
+        functions = []
         for N in [10, 224]:    # input sizes
             for K in [1, 3, 5]:    # filter sizes
                 M = N - K + 1    # output size
@@ -2327,34 +2514,32 @@ class DSLTest_09Parameters(unittest.TestCase):
 
                 schedule = nest.create_schedule()
 
-                A_test = np.random.random(A.shape).astype(np.float32)
-                B_test = np.random.random(B.shape).astype(np.float32)
-                C_test = np.random.random(C.shape).astype(np.float32)
+                A_test = _random_float32(A.shape)
+                B_test = _random_float32(B.shape)
+                C_test = _random_float32(C.shape)
                 correctness_check_values = {
                     "pre": [A_test, B_test, C_test],
-                    "post": [A_test, B_test, C_test + np.convolve(np.flip(B_test), A_test, "valid")]
+                    "post": [A_test, B_test, C_test + _sliding_windows(A_test, K) @ B_test]
                 }
 
                 # Skew dimension i with respect to dimension j with unroll loop not smaller than P.
                 schedule.skew(i, j, P)
 
-                # create a HAT package and add the function to it
-                package = Package()
-                package_name = f"test_parameterization_3_skew_i_j_{N}_{K}"
                 function = package.add(
                     schedule, args=(A, B, C), parameters={P: 0}, base_name=f"schedule_test_skew_i_j_{N}_{K}"
                 )
-                output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
-
-                # build the HAT package
-                with verifiers.VerifyPackage(self, package_name, output_dir) as v:
-                    package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
-                    if correctness_check_values:
-                        v.check_correctness(
-                            function.name,
-                            before=correctness_check_values["pre"],
-                            after=correctness_check_values["post"]
-                        )
+                functions.append((function, correctness_check_values))
+
+        package_name = "test_parameterization_3"
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+
+        # build the HAT package
+        with verifiers.VerifyPackage(self, package_name, output_dir) as v:
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
+            for function, correctness_check_values in functions:
+                v.check_correctness(
+                    function.name, before=correctness_check_values["pre"], after=correctness_check_values["post"]
+                )
 
     def test_parameterization_4(self) -> None:
         from accera import create_parameters, Nest
@@ -2401,12 +2586,14 @@ class DSLTest_09Parameters(unittest.TestCase):
 
         schedule.reorder(i, ii, k, j, jj, kk)
 
-        A_test = np.random.random(A.shape).astype(np.float32)
-        B_test = np.random.random(B.shape).astype(np.float32)
-        C_test = np.random.random(C.shape).astype(np.float32)
+        A_test = _random_float32(A.shape)
+        B_test = _random_float32(B.shape)
+        C_test = _random_float32(C.shape)
+        C_ref = A_test @ B_test
+        C_ref += C_test
         correctness_check_values = {
             "pre": [A_test, B_test, C_test],
-            "post": [A_test, B_test, C_test + A_test @ B_test]
+            "post": [A_test, B_test, C_ref]
         }
 
         # create a HAT package and add the function to it
@@ -2457,12 +2644,14 @@ class DSLTest_09Parameters(unittest.TestCase):
         if sys.platform.startswith('win'):
             correctness_check_values = None
         else:
-            A_test = np.random.random(A.shape).astype(np.float32)
-            B_test = np.random.random(B.shape).astype(np.float32)
-            C_test = np.random.random(C.shape).astype(np.float32)
+            A_test = _random_float32(A.shape)
+            B_test = _random_float32(B.shape)
+            C_test = _random_float32(C.shape)
+            C_ref = A_test @ B_test
+            C_ref += C_test
             correctness_check_values = {
                 "pre": [A_test, B_test, C_test],
-                "post": [A_test, B_test, C_test + A_test @ B_test]
+                "post": [A_test, B_test, C_ref]
             }
 
         schedule = nest.create_schedule()
@@ -2472,106 +2661,70 @@ class DSLTest_09Parameters(unittest.TestCase):
 
         P1, P2, P3, P4, P5, P6, P7, P8 = create_parameters(8)
 
-        for policy in ["static", "dynamic"]:
-            plan = schedule.create_plan(target)
+        # every (indices, policy) variant is a function of a single package, so that the build cost is paid once
+        package = Package()
+        policies = ["static", "dynamic"]
 
-            # non-collapsed
-            plan.parallelize(indices=P1, policy=P2)
+        # non-collapsed
+        plan = schedule.create_plan(target)
+        plan.parallelize(indices=P1, policy=P2)
+        functions = package.add(
+            plan,
+            args=[A, B, C],
+            parameters=[{
+                P1: i,
+                P2: policy
+            } for policy in policies],
+            base_name="parameterized_vectorization_parallelization_test_i"
+        )
 
-            package_name = f"parameterized_test_parallelize_i_{policy}"
-            package = Package()
-            function = package.add(
-                plan,
-                args=[A, B, C],
-                parameters={
-                    P1: i,
-                    P2: policy
-                },
-                base_name=f"parameterized_vectorization_parallelization_test_i_{policy}"
-            )
+        # parallelizing middle index
+        plan_ii = schedule.create_plan(target)
+        plan_ii.parallelize(indices=P3, policy=P4)
+        functions += package.add(
+            plan_ii,
+            args=[A, B, C],
+            parameters=[{
+                P3: ii,
+                P4: policy
+            } for policy in policies],
+            base_name="parameterized_vectorization_parallelization_test_ii"
+        )
 
-            output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
-            with verifiers.VerifyPackage(self, package_name, output_dir) as v:
-                package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
-                if correctness_check_values:
-                    v.check_correctness(
-                        function.name, before=correctness_check_values["pre"], after=correctness_check_values["post"]
-                    )
+        # partial collapsed
+        plan_partial = schedule.create_plan(target)
+        plan_partial.parallelize(indices=P5, policy=P6)
+        functions += package.add(
+            plan_partial,
+            args=[A, B, C],
+            parameters=[{
+                P5: (i, ii, j),
+                P6: policy
+            } for policy in policies],
+            base_name="parameterized_vectorization_parallelization_test_i_ii_j"
+        )
 
-            # parallelizing middle index
-            plan_ii = schedule.create_plan(target)
-            plan_ii.parallelize(indices=P3, policy=P4)
-
-            package_name = f"parameterized_test_parallelize_ii_{policy}"
-            package_ii = Package()
-            function_ii = package_ii.add(
-                plan_ii,
-                args=[A, B, C],
-                parameters={
-                    P3: ii,
-                    P4: policy
-                },
-                base_name=f"parameterized_vectorization_parallelization_test_ii_{policy}"
-            )
+        # partial collapsed inner indices
+        plan_partial_inner = schedule.create_plan(target)
+        plan_partial_inner.parallelize(indices=P7, policy=P8)
+        functions += package.add(
+            plan_partial_inner,
+            args=[A, B, C],
+            parameters=[{
+                P7: (ii, j),
+                P8: policy
+            } for policy in policies],
+            base_name="parameterized_vectorization_parallelization_test_ii_j"
+        )
 
-            output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
-            with verifiers.VerifyPackage(self, package_name, output_dir) as v:
-                package_ii.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
+        package_name = "test_parameterization_5"
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir) as v:
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
             if correctness_check_values:
-                v.check_correctness(
-                    function_ii.name, before=correctness_check_values["pre"], after=correctness_check_values["post"]
-                )
-
-            # partial collapsed
-            plan_partial = schedule.create_plan(target)
-            plan_partial.parallelize(indices=P5, policy=P6)
-
-            package_name = f"parameterized_test_parallelize_i_ii_j_{policy}"
-            package_partial = Package()
-            function_partial = package_partial.add(
-                plan_ii,
-                args=[A, B, C],
-                parameters={
-                    P5: (i, ii, j),
-                    P6: policy
-                },
-                base_name=f"parameterized_vectorization_parallelization_test_i_ii_j_{policy}"
-            )
-
-            output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
-            with verifiers.VerifyPackage(self, package_name, output_dir) as v:
-                package_partial.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
-                if correctness_check_values:
+                for function in functions:
                     v.check_correctness(
-                        function_partial.name,
-                        before=correctness_check_values["pre"],
-                        after=correctness_check_values["post"]
-                    )
-
-            # partial collapsed inner indices
-            plan_partial_inner = schedule.create_plan(target)
-            plan_partial_inner.parallelize(indices=P7, policy=P8)
-
-            package_name = f"parameterized_test_parallelize_ii_j_{policy}"
-            package_partial_inner = Package()
-            function_partial_inner = package_partial_inner.add(
-                plan,
-                args=[A, B, C],
-                parameters={
-                    P7: (ii, j),
-                    P8: policy
-                },
-                base_name=f"parameterized_vectorization_parallelization_test_ii_j_{policy}"
-            )
-
-            output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
-            with verifiers.VerifyPackage(self, package_name, output_dir) as v:
-                package_partial_inner.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
-                if correctness_check_values:
-                    v.check_correctness(
-                        function_partial_inner.name,
-                        before=correctness_check_values["pre"],
-                        after=correctness_check_values["post"]
+                        function.name, before=correctness_check_values["pre"], after=correctness_check_values["post"]
                     )
 
     def test_parameterization_grid(self) -> None:
@@ -2607,8 +2760,9 @@ class DSLTest_09Parameters(unittest.TestCase):
         parameters = create_parameter_grid(parameter_grid)
         package.add(sched, args=(A, B, C), base_name="matmul", parameters=parameters)
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(name=package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(name=package_name, format=TEST_FORMAT_NOCHECK, mode=TEST_MODE_NOCHECK, output_dir=output_dir)
 
     def test_fusion_parameterization_1(self) -> None:
         from accera import create_parameters, Nest, fuse
@@ -2680,8 +2834,9 @@ class DSLTest_09Parameters(unittest.TestCase):
             }], base_name="fuse_3"
         )
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(name=package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(name=package_name, format=TEST_FORMAT_NOCHECK, mode=TEST_MODE_NOCHECK, output_dir=output_dir)
 
     def test_fusion_parameterization_2(self) -> None:
         """
@@ -2741,8 +2896,9 @@ class DSLTest_09Parameters(unittest.TestCase):
             }, base_name="fuse_2"
         )
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(name=package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(name=package_name, format=TEST_FORMAT_NOCHECK, mode=TEST_MODE_NOCHECK, output_dir=output_dir)
 
     def test_fusion_parameterization_3(self) -> None:
         from accera import create_parameters, Nest, fuse
@@ -2793,8 +2949,9 @@ class DSLTest_09Parameters(unittest.TestCase):
             }, base_name="fuse_2"
         )
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(name=package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(name=package_name, format=TEST_FORMAT_NOCHECK, mode=TEST_MODE_NOCHECK, output_dir=output_dir)
 
     def test_fusion_parameterization_4(self) -> None:
         from accera import create_parameters, Nest, fuse, create_parameter_grid
@@ -2889,8 +3046,9 @@ class DSLTest_09Parameters(unittest.TestCase):
             base_name="fuse_grid"
         )
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(name=package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(name=package_name, format=TEST_FORMAT_NOCHECK, mode=TEST_MODE_NOCHECK, output_dir=output_dir)
 
     def test_parameterization_auxiliary_data(self) -> None:
         from accera import create_parameters, create_parameter_grid, Nest, Schedule
@@ -2926,12 +3084,12 @@ class DSLTest_09Parameters(unittest.TestCase):
         parameters = create_parameter_grid(parameter_grid)
         package.add(sched, args=(A, B, C), base_name="matmul", parameters=parameters)
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(name=package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / package_name
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(name=package_name, format=TEST_FORMAT_NOCHECK, mode=TEST_MODE_NOCHECK, output_dir=output_dir)
 
-        hat_package = HATPackage(pathlib.Path(TEST_PACKAGE_DIR) / f"{package_name}.hat")
-        functions = [fn for fn in hat_package.get_functions()]
-        for function in functions:
+        hat_package = HATPackage(output_dir / f"{package_name}.hat")
+        for function in hat_package.get_functions():
             data_point = function.auxiliary['accera']['parameters']
             if data_point:
                 self.assertIn(int(data_point["P0"]), [8, 16])
@@ -2942,6 +3100,15 @@ class DSLTest_09Parameters(unittest.TestCase):
 
 
 class DSLTest_10Packages(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # 16x16 inputs and references shared by the debug mode tests
+        cls._A16 = _random_float32((16, 16))
+        cls._B16 = _random_float32((16, 16))
+        cls._C16 = _random_float32((16, 16))
+        cls._matmul_ref16 = cls._C16 + cls._A16 @ cls._B16
+        cls._fusion_ref16 = (cls._C16 + cls._A16) * cls._B16
+
     def _create_plan(self, target=Target.HOST) -> Function:
         A = Array(role=Array.Role.INPUT_OUTPUT, shape=(64, ))
 
@@ -2966,12 +3133,13 @@ class DSLTest_10Packages(unittest.TestCase):
         package.add(plan, args=(A, ), base_name="func1")
         package.add(plan, args=(A, ), base_name="func2")
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / "test_HAT_packages"
+        with verifiers.VerifyPackage(self, package_name, output_dir):
             package.build(
                 package_name,
                 format=Package.Format.HAT_STATIC,
                 mode=TEST_MODE,
-                output_dir=TEST_PACKAGE_DIR,
+                output_dir=output_dir,
                 platform=Package.Platform.RASPBIAN
             )
 
@@ -2983,8 +3151,9 @@ class DSLTest_10Packages(unittest.TestCase):
         package.add(plan, args=(A, ), base_name="func1")
         package.add(plan, args=(A, ), base_name="func2")
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(package_name, format=Package.Format.MLIR_STATIC, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / "test_MLIR_packages"
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(package_name, format=Package.Format.MLIR_STATIC, output_dir=output_dir)
 
     def test_default_output_dir(self) -> None:
         plan, A = self._create_plan()
@@ -2997,6 +3166,55 @@ class DSLTest_10Packages(unittest.TestCase):
         with verifiers.VerifyPackage(self, package_name):
             package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE)
 
+    def test_build_cache(self) -> None:
+        from accera import accc
+
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / "test_build_cache"
+        cache_dir = output_dir / "cache"
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+        def build(package_name, increment, mode):
+            A = Array(role=Array.Role.INPUT_OUTPUT, shape=(64, ))
+
+            nest = Nest(shape=(64, ))
+            i = nest.get_indices()
+
+            @nest.iteration_logic
+            def _():
+                A[i] += increment
+
+            package = Package()
+            function = package.add(nest, args=(A, ), base_name="func1")
+
+            # builds that dump intermediate IR are not cached, so use the plain HAT format
+            with verifiers.VerifyPackage(self, package_name, output_dir) as v:
+                package.build(package_name, format=Package.Format.HAT_DYNAMIC, mode=mode, output_dir=output_dir)
+
+                A_test = _random_float32(A.shape)
+                v.check_correctness(function.name, before=[A_test], after=[A_test + increment])
+
+        with mock.patch.dict(os.environ, {"ACCERA_BUILD_CACHE_DIR": str(cache_dir)}):
+            # a miss lowers the package and populates the cache
+            build("build_cache_miss", 2., Package.Mode.RELEASE)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            # a hit reuses the cached outputs instead of lowering again
+            with mock.patch.object(accc.AcceraProject, "generate_and_emit") as generate_and_emit:
+                build("build_cache_hit", 2., Package.Mode.RELEASE)
+                generate_and_emit.assert_not_called()
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            # changing the mode or the nest produces a new entry
+            build("build_cache_mode", 2., Package.Mode.DEBUG)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+            build("build_cache_nest", 3., Package.Mode.RELEASE)
+            self.assertEqual(len(os.listdir(cache_dir)), 3)
+
+            # losing the race to publish an entry discards the staged copy and keeps the build's own outputs
+            with mock.patch("os.rename", side_effect=OSError):
+                build("build_cache_race", 4., Package.Mode.RELEASE)
+            self.assertEqual(len(os.listdir(cache_dir)), 3)
+
     def test_debug_mode_1(self) -> None:
         M = N = K = 16
         A = Array(role=Array.Role.INPUT, element_type=ScalarType.float32, shape=(M, K))
@@ -3027,12 +3245,10 @@ class DSLTest_10Packages(unittest.TestCase):
                 package_name, format=TEST_FORMAT, output_dir=output_dir, mode=Package.Mode.DEBUG, tolerance=1e-5
             )
 
-            A_test = np.random.random(A.shape).astype(np.float32)
-            B_test = np.random.random(B.shape).astype(np.float32)
-            C_test = np.random.random(C.shape).astype(np.float32)
+            A_test, B_test, C_test = self._A16, self._B16, self._C16
 
             v.check_correctness(
-                function.name, before=[A_test, B_test, C_test], after=[A_test, B_test, C_test + A_test @ B_test]
+                function.name, before=[A_test, B_test, C_test], after=[A_test, B_test, self._matmul_ref16]
             )
 
     def test_debug_mode_2(self) -> None:
@@ -3067,13 +3283,11 @@ class DSLTest_10Packages(unittest.TestCase):
                 package_name, format=TEST_FORMAT, output_dir=output_dir, mode=Package.Mode.DEBUG, tolerance=1e-5
             )
 
-            A_test = np.random.random(A.shape).astype(np.float32)
-            B_test = np.random.random(B.shape).astype(np.float32)
-            C_test = np.random.random(C.shape).astype(np.float32)
+            A_test, B_test, C_test = self._A16, self._B16, self._C16
 
             try:
                 v.check_correctness(
-                    function.name, before=[A_test, B_test, C_test], after=[A_test, B_test, C_test + A_test @ B_test]
+                    function.name, before=[A_test, B_test, C_test], after=[A_test, B_test, self._matmul_ref16]
                 )
             except Exception as e:
                 print(e)
@@ -3119,12 +3333,10 @@ class DSLTest_10Packages(unittest.TestCase):
                 package_name, format=TEST_FORMAT, output_dir=output_dir, mode=Package.Mode.DEBUG, tolerance=1e-5
             )
 
-            A_test = np.random.random(A.shape).astype(np.float32)
-            B_test = np.random.random(B.shape).astype(np.float32)
-            C_test = np.random.random(C.shape).astype(np.float32)
+            A_test, B_test, C_test = self._A16, self._B16, self._C16
 
             v.check_correctness(
-                function.name, before=[A_test, B_test, C_test], after=[A_test, B_test, (C_test + A_test) * B_test]
+                function.name, before=[A_test, B_test, C_test], after=[A_test, B_test, self._fusion_ref16]
             )
 
     def test_debug_mode_fusion_2(self) -> None:
@@ -3174,13 +3386,11 @@ class DSLTest_10Packages(unittest.TestCase):
                 package_name, format=TEST_FORMAT, output_dir=output_dir, mode=Package.Mode.DEBUG, tolerance=1e-5
             )
 
-            A_test = np.random.random(A.shape).astype(np.float32)
-            B_test = np.random.random(B.shape).astype(np.float32)
-            C_test = np.random.random(C.shape).astype(np.float32)
+            A_test, B_test, C_test = self._A16, self._B16, self._C16
 
             try:
                 v.check_correctness(
-                    function.name, before=[A_test, B_test, C_test], after=[A_test, B_test, (C_test + A_test) * B_test]
+                    function.name, before=[A_test, B_test, C_test], after=[A_test, B_test, self._fusion_ref16]
                 )
             except Exception as e:
                 print(e)
@@ -3237,14 +3447,12 @@ class DSLTest_10Packages(unittest.TestCase):
                 package_name, format=TEST_FORMAT, output_dir=output_dir, mode=Package.Mode.DEBUG, tolerance=1e-5
             )
 
-            A_test = np.random.random(A.shape).astype(np.float32)
-            B_test = np.random.random(B.shape).astype(np.float32)
-            C_test = np.random.random(C.shape).astype(np.float32)
+            A_test, B_test, C_test = self._A16, self._B16, self._C16
 
             v.check_correctness(
                 function.name,
                 before=[A_test, B_test, C_test],
-                after=[A_test, B_test, (C_test + A_test) * B_test - 1.0]
+                after=[A_test, B_test, self._fusion_ref16 - 1.0]
             )
 
     def test_debug_mode_fusion_cascading_2(self) -> None:
@@ -3299,9 +3507,7 @@ class DSLTest_10Packages(unittest.TestCase):
                 package_name, format=TEST_FORMAT, output_dir=output_dir, mode=Package.Mode.DEBUG, tolerance=1e-5
             )
 
-            A_test = np.random.random(A.shape).astype(np.float32)
-            B_test = np.random.random(B.shape).astype(np.float32)
-            C_test = np.random.random(C.shape).astype(np.float32)
+            A_test, B_test, C_test = self._A16, self._B16, self._C16
 
             v.check_correctness(
                 function.name,
@@ -3338,14 +3544,16 @@ class DSLTest_10Packages(unittest.TestCase):
         package.add_description(other=description2)
         package.add_description(version="2.0")
 
-        with verifiers.VerifyPackage(self, package_name, TEST_PACKAGE_DIR):
-            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=TEST_PACKAGE_DIR)
+        output_dir = pathlib.Path(TEST_PACKAGE_DIR) / "test_add_description"
+        with verifiers.VerifyPackage(self, package_name, output_dir):
+            package.build(package_name, format=TEST_FORMAT, mode=TEST_MODE, output_dir=output_dir)
 
-        hat_file = HATFile.Deserialize(pathlib.Path(TEST_PACKAGE_DIR) / f"{package_name}.hat")
+        hat_file = HATFile.Deserialize(output_dir / f"{package_name}.hat")
         hat_description = hat_file.description.auxiliary
         self.assertEqual(hat_description["Dependencies"], description1["Dependencies"])
         self.assertEqual(hat_description["Documentation"], description2["Documentation"])
         self.assertNotIn("SHA", hat_description)
+        self.assertIn("SHA", description1)    # the caller's metadata is left untouched
         self.assertEqual(hat_description["Release Notes"], description2["Release Notes"])
         self.assertEqual(hat_file.description.version, "2.0")
         self.assertEqual(hat_file.description.author, "Microsoft Research")